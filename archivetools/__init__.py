@@ -1,14 +1,24 @@
 from .__version__ import __version__
 
 import os
+import errno
+import shutil
 import datetime
-from PIL import Image, ExifTags
+from PIL import Image
+import piexif
 import logging
+import logging.handlers
+import queue
+import atexit
+import threading
 from colorama import Fore, Style, init
 import hashlib
 import subprocess
 import re
+import json
 import getpass
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 
 
 
@@ -41,20 +51,109 @@ handler.setFormatter(ColoredFormatter())
 logging.basicConfig(level=logging.INFO, handlers=[handler])
 
 
+class _BatchingHandler(logging.handlers.MemoryHandler):
+    """
+    MemoryHandler that writes a whole batch to the console stream in one call.
+    A background thread also flushes every `interval` seconds, so progress shows
+    up even when records arrive slowly.
+    """
+
+    def __init__(self, capacity, flushLevel=logging.ERROR, target=None, interval=1.0):
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, args=(interval,), daemon=True)
+        self._flusher.start()
+
+    def _flush_periodically(self, interval):
+        while not self._stopped.wait(interval):
+            self.flush()
+
+    def close(self):
+        self._stopped.set()
+        super().close()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.target and self.buffer:
+                text = ''.join(self.target.format(r) + self.target.terminator for r in self.buffer)
+                self.target.stream.write(text)
+                self.target.flush()
+                self.buffer.clear()
+        finally:
+            self.release()
+
+
+def buffer_console_logging(capacity=1000, interval=1.0):
+    """
+    Buffer console log lines and write them in batches instead of one write per line.
+    Warnings and errors flush straight away, the rest at least every `interval`
+    seconds; whatever is left is written at interpreter exit.
+    """
+    root = logging.getLogger()
+    buffered = _BatchingHandler(capacity, flushLevel=logging.WARNING, target=handler, interval=interval)
+    root.removeHandler(handler)
+    root.addHandler(buffered)
+    return buffered
+
+
+def queue_console_logging():
+    """
+    Hand log records to a background thread. Worker threads only enqueue; the
+    listener writes through whatever handlers the root logger had before.
+    The queue is drained when the interpreter exits.
+    """
+    root = logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    # registered after logging's own shutdown hook, so it runs first
+    atexit.register(listener.stop)
+    return listener
+
+
 
 
 # ========================================
 # definitions
 # ========================================
-SIDECAR_EXTENSIONS = ['.aae', '.xmp', '.json', '.txt', '.srt', '.xml', '.csv', '.ini', '.yaml', '.yml', '.md', '.log', '.nfo', '.sub', '.idx', '.mta', '.vtt', '.lrc']
-IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.tiff', '.tif', '.psd', '.heic', '.nef', '.gif', '.bmp', '.dng', '.raw', '.svg', '.webp', '.cr2', '.arw', '.orf', '.rw2', '.ico', '.eps', '.ai', '.indd']
-VIDEO_EXTENSIONS = ['.mp4', '.mov', '.avi', '.mkv', '.flv', '.wmv', '.webm', '.3gp', '.mpeg', '.mpg', '.m4v', '.mts', '.ts', '.vob', '.mxf', '.ogv', '.rm', '.divx', '.asf', '.f4v', '.m2ts', '.nev']
-OTHER_EXTENSIONS = ['.gpx', '.kmz', '.kml']
+SIDECAR_EXTENSIONS = ('.aae', '.xmp', '.json', '.txt', '.srt', '.xml', '.csv', '.ini', '.yaml', '.yml', '.md', '.log', '.nfo', '.sub', '.idx', '.mta', '.vtt', '.lrc')
+IMAGE_EXTENSIONS = frozenset(['.jpg', '.jpeg', '.png', '.tiff', '.tif', '.psd', '.heic', '.nef', '.gif', '.bmp', '.dng', '.raw', '.svg', '.webp', '.cr2', '.arw', '.orf', '.rw2', '.ico', '.eps', '.ai', '.indd'])
+VIDEO_EXTENSIONS = frozenset(['.mp4', '.mov', '.avi', '.mkv', '.flv', '.wmv', '.webm', '.3gp', '.mpeg', '.mpg', '.m4v', '.mts', '.ts', '.vob', '.mxf', '.ogv', '.rm', '.divx', '.asf', '.f4v', '.m2ts', '.nev'])
+OTHER_EXTENSIONS = frozenset(['.gpx', '.kmz', '.kml'])
 JUNK_FILENAMES = ["desktop.ini", ".DS_Store", "Thumbs.db", ".Spotlight-V100", ".Trashes", "__MACOSX"]
 JUNK_PREFIXES = ["._"]
-MEDIA_EXTENSIONS = list(set(IMAGE_EXTENSIONS + VIDEO_EXTENSIONS + OTHER_EXTENSIONS))
+MEDIA_EXTENSIONS = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS | OTHER_EXTENSIONS
 MONTH_NAMES = {1: 'Januar', 2: 'Februar', 3: 'März', 4: 'April', 5: 'Mai', 6: 'Juni', 7: 'Juli', 8: 'August', 9: 'September', 10: 'Oktober', 11: 'November', 12: 'Dezember'}
 WEEK_PREFIX = "KW"
+# extension -> position in SIDECAR_EXTENSIONS
+_SIDECAR_ORDER = {ext: i for i, ext in enumerate(SIDECAR_EXTENSIONS)}
+# filename date patterns, most specific first; groups are year, month, day[, hour, minute, second]
+FILENAME_DATE_PATTERNS = [
+    re.compile(r"(\d{4})_(\d{2})_(\d{2})_(\d{2})_(\d{2})_(\d{2})"),
+    re.compile(r"(\d{4})(\d{2})(\d{2})[_-](\d{2})(\d{2})(\d{2})"),
+    re.compile(r"(\d{4})[._-](\d{2})[._-](\d{2})"),
+    re.compile(r"(\d{4})(\d{2})(\d{2})"),
+]
+EXIF_DATE_TAGS = (("DateTime", 0x0132), ("DateTimeOriginal", 0x9003), ("DateTimeDigitized", 0x9004))
+# ISO 8601 date with optional time and UTC offset; groups are year .. second, offset
+_ISO_DATE = rb"(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2}))?(?:\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?"
+ISO_DATE_RE = re.compile(_ISO_DATE)
+# a date-named key or attribute (XMP, XML, key: value text) followed by an ISO date
+# capture-date keys read from text sidecars, most trusted first; ModifyDate,
+# MetadataDate and other edit times are never used
+SIDECAR_DATE_KEYS = (b'datetimeoriginal', b'createdate', b'datecreated', b'date')
+_SIDECAR_KEY_RANK = {key: rank for rank, key in enumerate(SIDECAR_DATE_KEYS)}
+# one of those keys as a whole name (optionally namespaced, e.g. xmp:CreateDate) as an
+# attribute, element or key: value pair, followed by an ISO date
+SIDECAR_DATE_RE = re.compile(
+    rb"(?i)(?<![\w-])(?:[\w-]+:)?(DateTimeOriginal|CreateDate|DateCreated|date)[\"']?\s*(?:[:=]|>)\s*[\"']?\s*" + _ISO_DATE
+)
+# keys checked in JSON sidecars, in order of preference
+JSON_SIDECAR_DATE_KEYS = ('date', 'photoTakenTime', 'creationTime', 'DateTimeOriginal', 'CreateDate', 'createDate', 'dateTaken')
 
 
 
@@ -78,23 +177,145 @@ def prompt_password(confirm=True):
 # ========================================
 # Function to get all available dates from a file and its sidecar
 # ========================================
-def get_dates_from_file(file_path):
-    dates = {}
-    # Get EXIF dates
+def _parse_exif_datetime(value):
+    """
+    Parse an EXIF "YYYY:MM:DD HH:MM:SS" value (str or bytes) by slicing its fixed-width
+    fields, which avoids strptime's format parsing. Irregular values go through strptime.
+    """
+    if isinstance(value, bytes):
+        value = value.decode("ascii", "ignore")
+    value = value.rstrip("\x00")
+    if len(value) == 19 and value[4] == ":" and value[7] == ":" and value[10] == " ":
+        try:
+            return datetime.datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                                     int(value[11:13]), int(value[14:16]), int(value[17:19]))
+        except ValueError:
+            pass
+    return datetime.datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
+
+def _iso_match_to_datetime(match):
+    """
+    datetime for an ISO_DATE_RE / SIDECAR_DATE_RE match, or None if it is not a real date.
+    Dates with a UTC offset are converted to naive local time like the other sources.
+    """
+    # the ISO date groups are always the last seven
+    year, month, day, hour, minute, second, offset = match.groups()[-7:]
     try:
-        with Image.open(file_path) as img:
-            exif_data = img._getexif()
-            if exif_data:
-                for tag, value in exif_data.items():
-                    decoded = ExifTags.TAGS.get(tag, tag)
-                    if decoded in ["DateTime", "DateTimeOriginal", "DateTimeDigitized"]:
-                        dates[decoded] = datetime.datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
-    except Exception:
-        pass
+        parsed = datetime.datetime(int(year), int(month), int(day),
+                                   int(hour or 0), int(minute or 0), int(second or 0))
+        if offset:
+            if offset == b"Z":
+                tz = datetime.timezone.utc
+            else:
+                sign = -1 if offset[:1] == b"-" else 1
+                digits = offset[1:].replace(b":", b"")
+                tz = datetime.timezone(sign * datetime.timedelta(hours=int(digits[:2]), minutes=int(digits[2:])))
+            parsed = parsed.replace(tzinfo=tz).astimezone().replace(tzinfo=None)
+    except (ValueError, OverflowError, OSError):
+        return None
+    return parsed
+
+def _json_sidecar_date(data):
+    """
+    First date found under JSON_SIDECAR_DATE_KEYS in a parsed JSON sidecar, or None.
+    Strings are read as ISO or YYYYMMDD dates; digit strings only count as epoch
+    seconds inside a Google Takeout {"timestamp": ...} value.
+    """
+    if not isinstance(data, dict):
+        return None
+    for key in JSON_SIDECAR_DATE_KEYS:
+        value = data.get(key)
+        takeout = isinstance(value, dict)
+        # Google Takeout: {"timestamp": "1577880000", "formatted": "..."}
+        if takeout:
+            value = value.get('timestamp')
+        if isinstance(value, str):
+            text = value.strip()
+            match = ISO_DATE_RE.match(text.encode())
+            parsed = match and _iso_match_to_datetime(match)
+            if parsed:
+                return parsed
+            if len(text) == 8 and text.isdigit():
+                try:
+                    return _yyyymmdd(text)
+                except ValueError:
+                    pass
+            if not (takeout and text.isdigit()):
+                continue
+            value = int(text)
+        # bool is an int subclass; true/false is never a date
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            try:
+                return datetime.datetime.fromtimestamp(value)
+            except (ValueError, OverflowError, OSError):
+                continue
+    return None
+
+def _text_sidecar_date(data):
+    """
+    Capture date in an XMP/XML/text sidecar, or None. When several keys are present
+    the one earliest in SIDECAR_DATE_KEYS wins, wherever it appears in the file.
+    """
+    best_rank = best = None
+    for match in SIDECAR_DATE_RE.finditer(data):
+        rank = _SIDECAR_KEY_RANK[match.group(1).lower()]
+        if best_rank is not None and rank >= best_rank:
+            continue
+        parsed = _iso_match_to_datetime(match)
+        if parsed:
+            best_rank, best = rank, parsed
+            if rank == 0:
+                break
+    return best
+
+def _yyyymmdd(digits):
+    """datetime for an 8-digit YYYYMMDD string; ValueError if it is not a real date."""
+    return datetime.datetime(int(digits[0:4]), int(digits[4:6]), int(digits[6:8]))
+
+
+def get_dates_from_file(file_path, stat_result=None, sidecars=None, exif_dict=None):
+    """
+    Collect every candidate date for file_path into a {source: datetime} dict.
+    Pass `stat_result` when the caller already has one to skip the extra os.stat.
+    Pass `sidecars` (paths or DirEntry objects, e.g. from index_sidecars) when the folder was already
+    listed, so the SIDECAR_EXTENSIONS candidates aren't probed one by one.
+    Pass `exif_dict` (a piexif.load result) for a JPEG the caller already parsed.
+    """
+    dates = {}
+    file_extension = os.path.splitext(file_path)[1].lower()
+    # Get EXIF dates; videos and other media carry none, so don't open them
+    use_pillow = file_extension in IMAGE_EXTENSIONS
+    if file_extension in ('.jpg', '.jpeg'):
+        try:
+            # piexif stops reading at the APP1 segment; no image object is set up
+            if exif_dict is None:
+                exif_dict = piexif.load(file_path)
+            for decoded, value in (
+                ("DateTime", exif_dict["0th"].get(piexif.ImageIFD.DateTime)),
+                ("DateTimeOriginal", exif_dict["Exif"].get(piexif.ExifIFD.DateTimeOriginal)),
+                ("DateTimeDigitized", exif_dict["Exif"].get(piexif.ExifIFD.DateTimeDigitized)),
+            ):
+                if value:
+                    dates[decoded] = _parse_exif_datetime(value)
+            use_pillow = False
+        except Exception:
+            # malformed IFD, or not really a JPEG: Pillow is more lenient and opens by content
+            dates.clear()
+    if use_pillow:
+        try:
+            with Image.open(file_path) as img:
+                exif_data = img._getexif()
+                if exif_data:
+                    for decoded, tag in EXIF_DATE_TAGS:
+                        value = exif_data.get(tag)
+                        if value:
+                            dates[decoded] = _parse_exif_datetime(value)
+        except Exception:
+            pass
 
     # Get file creation and modification dates
     try:
-        stat = os.stat(file_path)
+        stat = stat_result if stat_result is not None else os.stat(file_path)
         dates['Created'] = datetime.datetime.fromtimestamp(stat.st_ctime)
         dates['Modified'] = datetime.datetime.fromtimestamp(stat.st_mtime)
     except Exception as e:
@@ -102,7 +323,7 @@ def get_dates_from_file(file_path):
 
     # Get creation_time from video metadata via ffprobe
     try:
-        if os.path.splitext(file_path)[1].lower() in VIDEO_EXTENSIONS:
+        if file_extension in VIDEO_EXTENSIONS:
             result = subprocess.run(
                 ["ffprobe", "-v", "error", "-select_streams", "v:0",
                  "-show_entries", "format_tags=creation_time",
@@ -127,51 +348,44 @@ def get_dates_from_file(file_path):
         logging.warning(f"ffprobe failed: {e}", extra={'target': os.path.basename(file_path)})
 
     # Get dates from sidecar files
-    base_path, file_ext = os.path.splitext(file_path)
-    for ext in SIDECAR_EXTENSIONS:
-        for sidecar_path in [f"{base_path}{ext}", f"{base_path}{file_ext}{ext}"]:
-            if os.path.exists(sidecar_path):
+    if sidecars is None:
+        base_path, file_ext = os.path.splitext(file_path)
+        sidecars = [
+            sidecar_path
+            for ext in SIDECAR_EXTENSIONS
+            for sidecar_path in (f"{base_path}{ext}", f"{base_path}{file_ext}{ext}")
+            if os.path.exists(sidecar_path)
+        ]
+    for sidecar_path in sidecars:
+        ext = os.path.splitext(sidecar_path)[1].lower()
+        try:
+            # sidecars are small: read once and scan the whole buffer
+            with open(sidecar_path, 'rb') as f:
+                data = f.read()
+            if ext == '.json':
                 try:
-                    with open(sidecar_path, 'r') as f:
-                        if ext == '.json':
-                            try:
-                                import json
-                                sidecar_data = json.load(f)
-                                if 'date' in sidecar_data:
-                                    try:
-                                        date_value = sidecar_data['date']
-                                        parsed_date = datetime.datetime.fromisoformat(date_value)
-                                        dates[f"Sidecar ({ext})"] = parsed_date
-                                    except ValueError:
-                                        pass
-                            except Exception as e:
-                                logging.warning(f"could not parse JSON sidecar file: {e}", extra={'target': os.path.basename(sidecar_path)})
-                        else:
-                            for line in f:
-                                if 'date' in line.lower():
-                                    try:
-                                        potential_date = datetime.datetime.fromisoformat(line.strip())
-                                        dates[f"Sidecar ({ext})"] = potential_date
-                                    except ValueError:
-                                        pass
-                except Exception as e:
-                    logging.warning(f"could not read sidecar file: {e}", extra={'target': os.path.basename(sidecar_path)})
+                    parsed_date = _json_sidecar_date(json.loads(data))
+                except ValueError as e:
+                    logging.warning(f"could not parse JSON sidecar file: {e}", extra={'target': os.path.basename(sidecar_path)})
+                    parsed_date = None
+            else:
+                parsed_date = _text_sidecar_date(data)
+            if parsed_date:
+                dates[f"Sidecar ({ext})"] = parsed_date
+        except FileNotFoundError:
+            # moved away (e.g. with another media file sharing it) since it was listed
+            continue
+        except Exception as e:
+            logging.warning(f"could not read sidecar file: {e}", extra={'target': os.path.basename(sidecar_path)})
 
     # Extract date from filename using common patterns
     filename = os.path.basename(file_path)
-    date_patterns = [
-        (r"(\d{4})_(\d{2})_(\d{2})_(\d{2})_(\d{2})_(\d{2})", "%Y%m%d%H%M%S"),
-        (r"(\d{4})(\d{2})(\d{2})[_-](\d{2})(\d{2})(\d{2})", "%Y%m%d%H%M%S"),
-        (r"(\d{4})[._-](\d{2})[._-](\d{2})", "%Y%m%d"),
-        (r"(\d{4})(\d{2})(\d{2})", "%Y%m%d"),
-    ]
-    for pattern, fmt in date_patterns:
-        match = re.search(pattern, filename)
+    for pattern in FILENAME_DATE_PATTERNS:
+        match = pattern.search(filename)
         if match:
             try:
-                extracted = ''.join(match.groups())
-                parsed_date = datetime.datetime.strptime(extracted, fmt)
-                dates['Filename'] = parsed_date
+                # the groups are fixed-width digits, so no strptime round trip is needed
+                dates['Filename'] = datetime.datetime(*map(int, match.groups()))
                 break
             except ValueError:
                 continue
@@ -180,17 +394,12 @@ def get_dates_from_file(file_path):
     folder_name = os.path.basename(os.path.dirname(file_path))
     try:
         if re.match(r"^\d{8}$", folder_name):
-            parsed_date = datetime.datetime.strptime(folder_name, "%Y%m%d")
-            dates["FolderDate"] = parsed_date
+            dates["FolderDate"] = _yyyymmdd(folder_name)
         elif re.match(r"^\d{4}$", folder_name):
-            parsed_date = datetime.datetime.strptime(folder_name, "%Y")
-            dates["FolderDate"] = parsed_date
+            dates["FolderDate"] = datetime.datetime(int(folder_name), 1, 1)
         elif re.match(r"^\d{8}-\d{8}", folder_name):
-            start_str, end_str = folder_name.split("-")[0], folder_name.split("-")[1].split(" ")[0]
-            start_date = datetime.datetime.strptime(start_str, "%Y%m%d")
-            end_date = datetime.datetime.strptime(end_str, "%Y%m%d")
-            dates["FolderDateRangeStart"] = start_date
-            dates["FolderDateRangeEnd"] = end_date
+            dates["FolderDateRangeStart"] = _yyyymmdd(folder_name[0:8])
+            dates["FolderDateRangeEnd"] = _yyyymmdd(folder_name[9:17])
     except Exception as e:
         logging.warning(f"Could not extract date from folder name: {e}", extra={'target': folder_name})
 
@@ -218,12 +427,12 @@ def select_date(dates: dict, mode: str = 'default', midnight_shift: int = 0) ->
 
     def get_oldest(date_dict: dict):
         if date_dict:
-            return min(date_dict.items(), key=lambda x: x[1])
+            return min(date_dict.items(), key=itemgetter(1))
         return None
 
     def get_newest(date_dict: dict):
         if date_dict:
-            return max(date_dict.items(), key=lambda x: x[1])
+            return max(date_dict.items(), key=itemgetter(1))
         return None
 
     selected = None
@@ -319,11 +528,81 @@ def calculate_file_hash(file_path):
         raise
     return hash_sha256.hexdigest()
 
+def index_sidecars(names):
+    """
+    Map sidecar stems to sidecar names: "IMG_1.xmp" is filed under "IMG_1" and
+    "IMG_1.jpg.json" under "IMG_1.jpg". A media file then finds all of its
+    sidecars with two lookups, its base name and its full name, instead of
+    probing every SIDECAR_EXTENSIONS candidate. Lists follow SIDECAR_EXTENSIONS order.
+    Extensions match case-insensitively, so "IMG_1.AAE" and "IMG_1.XMP" are found too.
+    """
+    index = {}
+    for name in names:
+        stem, ext = os.path.splitext(name)
+        if ext.lower() in _SIDECAR_ORDER:
+            index.setdefault(stem, []).append(name)
+    for sidecars in index.values():
+        if len(sidecars) > 1:
+            sidecars.sort(key=lambda n: _SIDECAR_ORDER[os.path.splitext(n)[1].lower()])
+    return index
+
+
+def fast_move(src, dst, exclusive=False):
+    """
+    Move src to dst with a single rename syscall; only fall back to shutil.move
+    (copy + delete) when the two paths are on different filesystems.
+    With `exclusive=True` dst is first claimed with O_CREAT|O_EXCL, so an existing
+    file is never replaced and FileExistsError is raised instead.
+    """
+    if exclusive:
+        os.close(os.open(dst, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            if exclusive:
+                # drop the placeholder we created
+                try:
+                    os.remove(dst)
+                except OSError:
+                    pass
+            raise
+        shutil.move(src, dst)
+
+
+def run_in_threads(func, items, jobs):
+    """
+    Call func(item) for every item on `jobs` worker threads and return the results
+    in order. On Ctrl-C the items that haven't started are cancelled; only the
+    running ones are finished before KeyboardInterrupt propagates.
+    """
+    ex = ThreadPoolExecutor(max_workers=max(1, jobs))
+    futures = [ex.submit(func, item) for item in items]
+    results = []
+    try:
+        for future in futures:
+            while True:
+                try:
+                    # a bounded wait keeps the main thread responsive to Ctrl-C on Windows
+                    results.append(future.result(timeout=0.5))
+                    break
+                except FuturesTimeoutError:
+                    continue
+    except KeyboardInterrupt:
+        # by hand: shutdown(cancel_futures=True) needs Python 3.9
+        for future in futures:
+            future.cancel()
+        raise
+    finally:
+        ex.shutdown(wait=True)
+    return results
+
 # ========================================
 # summary helpers (end-of-run reporting)
 # ========================================
 from collections import defaultdict
 from datetime import timedelta
+import threading
 
 def human_bytes(num_bytes: int) -> str:
     """Return human friendly size (e.g., '31.7 GB')."""
@@ -368,6 +647,7 @@ class RunSummary:
         self.counters = defaultdict(int)   # any numeric counters
         self.metrics  = {}                 # arbitrary other values
         self.notes = []                    # misc strings (e.g., sample failures)
+        self._lock = threading.Lock()      # tools may update counters from worker threads
 
     # timing
     @property
@@ -384,16 +664,30 @@ class RunSummary:
 
     # counters & metrics
     def inc(self, key: str, n: int = 1):
-        self.counters[key] += n
+        with self._lock:
+            self.counters[key] += n
 
     def add_bytes(self, key: str, n: int):
-        self.counters[key] += int(n)
+        with self._lock:
+            self.counters[key] += int(n)
 
     def set(self, key: str, value):
-        self.metrics[key] = value
+        with self._lock:
+            self.metrics[key] = value
 
     def note(self, text: str):
-        self.notes.append(text)
+        with self._lock:
+            self.notes.append(text)
+
+    def extend_range(self, low_key: str, high_key: str, value):
+        """Widen the metrics[low_key]..metrics[high_key] range to include value."""
+        with self._lock:
+            low = self.metrics.get(low_key)
+            if low is None or value < low:
+                self.metrics[low_key] = value
+            high = self.metrics.get(high_key)
+            if high is None or value > high:
+                self.metrics[high_key] = value
 
     def __getitem__(self, key: str):
         # convenience for counters/metrics
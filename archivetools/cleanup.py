@@ -44,15 +44,11 @@ def cleanup_files(folder, verbose=False, summary=None):
                 try:
                     if verbose:
                         logging.debug(f"Deleting empty sidecar file: {file_path}", extra={'target': name})
-                    size = 0
-                    try:
-                        size = os.path.getsize(file_path)
-                    except OSError:
-                        pass
+                    # is_empty_file already stat()ed it: nothing to add to freed_bytes
                     os.remove(file_path)
                     removed_files.append(file_path)
                     if s:
-                        s.inc('files_removed'); s.inc('empty_sidecars_removed'); s.add_bytes('freed_bytes', size)
+                        s.inc('files_removed'); s.inc('empty_sidecars_removed')
                     logging.info("Deleted empty sidecar file.", extra={'target': name})
                 except Exception as e:
                     logging.error(f"Error deleting file: {e}", extra={'target': name})
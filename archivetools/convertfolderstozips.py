@@ -1,9 +1,56 @@
 import os
-import shutil
+import stat
 import argparse
 import pyzipper
 import logging
-from archivetools import __version__, calculate_file_hash, prompt_password, RunSummary
+from concurrent.futures import ThreadPoolExecutor
+from archivetools import __version__, calculate_file_hash, prompt_password, RunSummary, run_in_threads
+
+# formats whose payload is already compressed; DEFLATE burns CPU on them for ~0% gain
+PRECOMPRESSED_EXTENSIONS = frozenset([
+    '.jpg', '.jpeg', '.png', '.heic', '.gif', '.webp', '.dng', '.cr2', '.arw', '.orf', '.rw2', '.nef',
+    '.mp4', '.mov', '.avi', '.mkv', '.flv', '.wmv', '.webm', '.3gp', '.mpeg', '.mpg', '.m4v', '.mts',
+    '.ts', '.m2ts', '.vob', '.ogv', '.f4v', '.mp3', '.m4a', '.aac', '.ogg', '.flac', '.opus',
+    '.zip', '.7z', '.rar', '.gz', '.bz2', '.xz', '.kmz',
+])
+
+
+def _is_link(st):
+    """True for an lstat result of a symlink or a Windows junction (or other reparse point)."""
+    if stat.S_ISLNK(st.st_mode):
+        return True
+    return bool(getattr(st, 'st_file_attributes', 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def _collect_tree(path, files, dirs):
+    """Append path's files and links to `files` and its directories, children first, to `dirs`."""
+    with os.scandir(path) as it:
+        for entry in it:
+            # never descend into links; the DirEntry stat is cached (from the listing on Windows)
+            if entry.is_dir(follow_symlinks=False) and not _is_link(entry.stat(follow_symlinks=False)):
+                _collect_tree(entry.path, files, dirs)
+            else:
+                # files, symlinks and junctions: remove the entry itself, not its target
+                files.append(entry.path)
+    dirs.append(path)
+
+
+def _fast_rmtree(root, max_workers=16):
+    """
+    Delete a verified source folder. Files are unlinked from a thread pool
+    (unlink releases the GIL), then the directories are removed bottom-up.
+    Like shutil.rmtree, symlinks and Windows junctions inside the folder are
+    removed without touching what they point to, and a linked root is refused.
+    """
+    if _is_link(os.lstat(root)):
+        raise OSError(f"Cannot delete a symbolic link or junction: {root}")
+    files = []
+    dirs = []
+    _collect_tree(root, files, dirs)
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        list(ex.map(os.unlink, files))
+    for d in dirs:
+        os.rmdir(d)
 
 
 def verify_zipped_contents(folder_path, zip_file_path, password=None, verbose=False):
@@ -11,47 +58,52 @@ def verify_zipped_contents(folder_path, zip_file_path, password=None, verbose=Fa
     Verify that every file in folder_path exists in the zip with identical SHA-256.
     Returns True on full match, False otherwise.
     """
+    zip_name = os.path.basename(zip_file_path)
     if verbose:
         logging.debug(
-            f"Verifying {os.path.basename(zip_file_path)} against {os.path.basename(folder_path)}",
-            extra={'target': os.path.basename(zip_file_path)},
+            "Verifying %s against %s",
+            zip_name, os.path.basename(folder_path),
+            extra={'target': zip_name},
         )
 
-    # Map relative path -> sha256 from source folder
-    expected = {}
+    # Map relative path -> source path; listing only, nothing is read yet
+    sources = {}
     for root, _, files in os.walk(folder_path):
         for name in files:
             fpath = os.path.join(root, name)
             rel = os.path.relpath(fpath, folder_path).replace("\\", "/")
-            try:
-                expected[rel] = calculate_file_hash(fpath)
-            except Exception as e:
-                logging.error(
-                    f"Failed to hash source file during verification: {e}",
-                    extra={'target': name},
-                )
-                return False
+            sources[rel] = fpath
 
     try:
         with pyzipper.AESZipFile(zip_file_path, 'r') as zipf:
             if password:
                 zipf.setpassword(password.encode())
             names = [n for n in zipf.namelist() if not n.endswith("/")]
-            # quick cardinality check
-            if len(names) != len(expected):
+            # structural checks against the central directory before any content is hashed
+            if len(names) != len(sources):
                 logging.error(
                     "Verification failed: file count differs (zip %d vs source %d)",
-                    len(names), len(expected),
-                    extra={'target': os.path.basename(zip_file_path)},
+                    len(names), len(sources),
+                    extra={'target': zip_name},
                 )
                 return False
-            # compare hashes
+            unexpected = set(names).difference(sources)
+            if unexpected:
+                logging.error(
+                    "Verification failed: unexpected entry in zip: %s",
+                    min(unexpected),
+                    extra={'target': zip_name},
+                )
+                return False
+            # compare hashes, stopping at the first mismatch
             for rel in names:
-                if rel not in expected:
+                try:
+                    expected = calculate_file_hash(sources[rel])
+                except Exception as e:
                     logging.error(
-                        "Verification failed: unexpected entry in zip: %s",
-                        rel,
-                        extra={'target': os.path.basename(zip_file_path)},
+                        "Failed to hash source file during verification: %s",
+                        e,
+                        extra={'target': os.path.basename(rel)},
                     )
                     return False
                 with zipf.open(rel, 'r') as f:
@@ -59,29 +111,31 @@ def verify_zipped_contents(folder_path, zip_file_path, password=None, verbose=Fa
                     h = hashlib.sha256()
                     for chunk in iter(lambda: f.read(4096), b""):
                         h.update(chunk)
-                    if h.hexdigest() != expected[rel]:
+                    if h.hexdigest() != expected:
                         logging.error(
                             "Verification failed: checksum mismatch for %s",
                             rel,
-                            extra={'target': os.path.basename(zip_file_path)},
+                            extra={'target': zip_name},
                         )
                         return False
     except RuntimeError as e:
         # bad password or encryption issue
         logging.error(
-            f"Verification error (password/encryption): {e}",
-            extra={'target': os.path.basename(zip_file_path)},
+            "Verification error (password/encryption): %s",
+            e,
+            extra={'target': zip_name},
         )
         return False
     except Exception as e:
         logging.error(
-            f"Error during verification: {e}",
-            extra={'target': os.path.basename(zip_file_path)},
+            "Error during verification: %s",
+            e,
+            extra={'target': zip_name},
         )
         return False
 
     if verbose:
-        logging.debug("Verification OK", extra={'target': os.path.basename(zip_file_path)})
+        logging.debug("Verification OK", extra={'target': zip_name})
     return True
 
 
@@ -90,6 +144,7 @@ def zip_folder(folder_path, zip_file_path, password=None, verbose=False, summary
     Create AES-256 zip (optional) for folder_path at zip_file_path.
     """
     s = summary
+    zip_name = os.path.basename(zip_file_path)
     os.makedirs(os.path.dirname(zip_file_path), exist_ok=True)
     try:
         with pyzipper.AESZipFile(
@@ -107,11 +162,16 @@ def zip_folder(folder_path, zip_file_path, password=None, verbose=False, summary
                     arcname = os.path.relpath(src, folder_path).replace("\\", "/")
                     if verbose:
                         logging.debug(
-                            f"Adding to zip: {arcname}",
-                            extra={'target': os.path.basename(zip_file_path)},
+                            "Adding to zip: %s",
+                            arcname,
+                            extra={'target': zip_name},
                         )
+                    if os.path.splitext(name)[1].lower() in PRECOMPRESSED_EXTENSIONS:
+                        compress_type = pyzipper.ZIP_STORED
+                    else:
+                        compress_type = pyzipper.ZIP_DEFLATED
                     try:
-                        zipf.write(src, arcname)
+                        zipf.write(src, arcname, compress_type=compress_type)
                         if s:
                             s.inc('files_archived')
                             try:
@@ -119,7 +179,7 @@ def zip_folder(folder_path, zip_file_path, password=None, verbose=False, summary
                             except OSError:
                                 pass
                     except Exception as e:
-                        logging.error(f"Failed to add to zip: {e}", extra={'target': name})
+                        logging.error("Failed to add to zip: %s", e, extra={'target': name})
                         if s:
                             s.inc('errors')
         # bytes of zip
@@ -131,22 +191,71 @@ def zip_folder(folder_path, zip_file_path, password=None, verbose=False, summary
         return True
     except PermissionError as e:
         logging.error(
-            f"Permission error while zipping: {e}",
-            extra={'target': os.path.basename(zip_file_path)},
+            "Permission error while zipping: %s",
+            e,
+            extra={'target': zip_name},
         )
         if s:
             s.inc('errors')
         return False
     except Exception as e:
         logging.error(
-            f"Error creating zip: {e}",
-            extra={'target': os.path.basename(zip_file_path)},
+            "Error creating zip: %s",
+            e,
+            extra={'target': zip_name},
         )
         if s:
             s.inc('errors')
         return False
 
 
+def _zip_one(folder_path, directory, password, verbose, s):
+    """Zip, verify and delete a single subfolder. Safe to run from worker threads."""
+    folder_name = os.path.basename(folder_path)
+    if verbose:
+        logging.debug(
+            "Processing folder: %s",
+            folder_name,
+            extra={'target': folder_name},
+        )
+    zip_name = f"{folder_name}.zip"
+    zip_file_path = os.path.join(directory, zip_name)
+    s.inc('folders_scanned')
+
+    if os.path.exists(zip_file_path):
+        logging.info("Zip already exists. Skipping.", extra={'target': zip_name})
+        s.inc('skipped_exists')
+        return
+
+    ok_zip = zip_folder(folder_path, zip_file_path, password=password, verbose=verbose, summary=s)
+    if not ok_zip:
+        s.inc('zip_failures')
+        return
+
+    s.inc('zipped')
+    if verbose:
+        logging.debug(
+            "Created zip: %s",
+            zip_file_path,
+            extra={'target': zip_name},
+        )
+
+    # verify
+    verified = verify_zipped_contents(folder_path, zip_file_path, password=password, verbose=verbose)
+    if verified:
+        s.inc('verified_ok')
+        try:
+            _fast_rmtree(folder_path)
+            s.inc('sources_deleted')
+            logging.info("Verification OK — deleted source folder.", extra={'target': folder_name})
+        except Exception as e:
+            logging.error("Failed to delete source folder after verify: %s", e, extra={'target': folder_name})
+            s.inc('errors')
+    else:
+        s.inc('verify_failures')
+        logging.warning("Verification failed — keeping source folder and zip for inspection.", extra={'target': folder_name})
+
+
 def zip_and_verify(args):
     directory = args.folder
     verbose = args.verbose
@@ -160,7 +269,8 @@ def zip_and_verify(args):
                 password = prompt_password(confirm=True)
             except Exception as e:
                 logging.error(
-                    f"Password input error: {e}",
+                    "Password input error: %s",
+                    e,
                     extra={'target': os.path.basename(directory)},
                 )
                 return
@@ -171,55 +281,13 @@ def zip_and_verify(args):
     s.set('aes256', bool(password))
 
     # iterate subfolders of the given directory
-    entries = [d for d in os.listdir(directory)]
-    folders = [
-        os.path.join(directory, d)
-        for d in entries
-        if os.path.isdir(os.path.join(directory, d))
-    ]
+    # DirEntry.is_dir() is answered from the listing on most filesystems
+    with os.scandir(directory) as it:
+        folders = [entry.path for entry in it if entry.is_dir()]
     total = len(folders)
 
-    for folder_path in folders:
-        folder_name = os.path.basename(folder_path)
-        if verbose:
-            logging.debug(
-                f"Processing folder: {folder_name}",
-                extra={'target': folder_name},
-            )
-        zip_file_path = os.path.join(directory, f"{folder_name}.zip")
-        s.inc('folders_scanned')
-
-        if os.path.exists(zip_file_path):
-            logging.info("Zip already exists. Skipping.", extra={'target': os.path.basename(zip_file_path)})
-            s.inc('skipped_exists')
-            continue
-
-        ok_zip = zip_folder(folder_path, zip_file_path, password=password, verbose=verbose, summary=s)
-        if not ok_zip:
-            s.inc('zip_failures')
-            continue
-
-        s.inc('zipped')
-        if verbose:
-            logging.debug(
-                f"Created zip: {zip_file_path}",
-                extra={'target': os.path.basename(zip_file_path)},
-            )
-
-        # verify
-        verified = verify_zipped_contents(folder_path, zip_file_path, password=password, verbose=verbose)
-        if verified:
-            s.inc('verified_ok')
-            try:
-                shutil.rmtree(folder_path)
-                s.inc('sources_deleted')
-                logging.info("Verification OK — deleted source folder.", extra={'target': folder_name})
-            except Exception as e:
-                logging.error(f"Failed to delete source folder after verify: {e}", extra={'target': folder_name})
-                s.inc('errors')
-        else:
-            s.inc('verify_failures')
-            logging.warning("Verification failed — keeping source folder and zip for inspection.", extra={'target': folder_name})
+    # Ctrl-C cancels the folders not started yet; running ones finish their zip/verify/delete
+    run_in_threads(lambda folder_path: _zip_one(folder_path, directory, password, verbose, s), folders, args.jobs)
 
     # emit end-of-run summary
     zipped = s['zipped'] or 0
@@ -270,6 +338,12 @@ def main():
         const=True,
         help='Enable AES-256 encryption. Provide a password directly, or pass the flag alone to be prompted.'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of folders to zip in parallel'
+    )
     parser.add_argument('--verbose', action='store_true', help='Enable verbose output')
     args = parser.parse_args()
 
@@ -147,8 +147,8 @@ def unzip_and_verify(args):
             s.inc('extract_failures')
             # tidy up empty partial folder
             try:
-                if os.path.isdir(target_folder) and not os.listdir(target_folder):
-                    os.rmdir(target_folder)
+                # rmdir only removes it if nothing was extracted; no listing needed
+                os.rmdir(target_folder)
             except Exception:
                 pass
             continue
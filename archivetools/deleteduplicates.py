@@ -1,6 +1,7 @@
 import os
 import sys
 import argparse
+import datetime
 import logging
 from collections import defaultdict
 from archivetools import (
@@ -22,6 +23,7 @@ def prioritize_file(files, mode="default", verbose=False):
     """
     dated = []
     for f in files:
+        dates = {}
         try:
             dates = get_dates_from_file(f)
             sel = select_date(dates, mode=mode)
@@ -32,10 +34,8 @@ def prioritize_file(files, mode="default", verbose=False):
         except Exception:
             dt = None
         if dt is None:
-            try:
-                dt = os.path.getmtime(f)
-            except Exception:
-                dt = 0
+            # get_dates_from_file already stat()ed the file; reuse its mtime
+            dt = dates.get('Modified') or datetime.datetime.min
         dated.append((f, dt))
     reverse = True if mode == "newest" else False
     keep = sorted(dated, key=lambda t: t[1], reverse=reverse)[0][0]
@@ -1,15 +1,19 @@
 import os
-import shutil
 import argparse
-from archivetools import __version__, logging, RunSummary
+from archivetools import __version__, logging, fast_move, RunSummary
 
 
-def get_new_name(base, extension, target_folder, verbose=False):
+def get_new_name(base, extension, existing, verbose=False):
+    """
+    Return the first "base(n)extension" name not in `existing` (the set of names
+    already in the target folder) and record it there.
+    """
     counter = 1
     new_name = f"{base}({counter}){extension}"
-    while os.path.exists(os.path.join(target_folder, new_name)):
+    while new_name in existing:
         counter += 1
         new_name = f"{base}({counter}){extension}"
+    existing.add(new_name)
     if verbose:
         logging.debug(
             f"Generated new filename to avoid conflict: {new_name}",
@@ -24,7 +28,9 @@ def flatten_folder(root_folder, rename_files, depth=None, verbose=False, summary
     - If `depth` is provided, only flatten items at most that many levels deep.
       (level 1 = immediate children of root).
     - Renames on conflict when `rename_files=True`, otherwise skips.
-    - Removes empty folders after moves.
+    - Removes folders that are left empty, in the same bottom-up pass.
+    - Folders are visited deepest first, so on conflicts the most deeply nested
+      file gets the first "(1)" suffix.
     """
     if not os.path.isdir(root_folder):
         logging.error(
@@ -50,43 +56,81 @@ def flatten_folder(root_folder, rename_files, depth=None, verbose=False, summary
     skipped_conflicts = 0
     folders_removed = 0
 
-    # first pass: move files up to root
-    for dirpath, dirnames, filenames in os.walk(root_folder):
+    # names currently in root; kept up to date as files are moved in
+    with os.scandir(root_folder) as it:
+        existing = {entry.name for entry in it}
+
+    # single bottom-up pass: children are emptied into root before their parent
+    # is visited, so each folder can be removed as soon as its files are moved
+    for dirpath, dirnames, filenames in os.walk(root_folder, topdown=False):
         # compute depth (0 for root)
         rel = os.path.relpath(dirpath, root_folder)
         level = 0 if rel in (".", "") else len(rel.split(os.sep))
         if level == 0:
             continue
-        if depth is not None and level > depth:
-            max_seen_level = max(max_seen_level, level)
-            continue
-
         max_seen_level = max(max_seen_level, level)
 
-        for fname in filenames:
-            src = os.path.join(dirpath, fname)
-            if not os.path.isfile(src):
-                continue  # just in case
+        if depth is None or level <= depth:
+            for fname in filenames:
+                src = os.path.join(dirpath, fname)
 
-            if s:
-                s.inc("found")
-
-            dst = os.path.join(root_folder, fname)
-
-            if os.path.exists(dst):
-                if rename_files:
-                    base, ext = os.path.splitext(fname)
-                    new_name = get_new_name(base, ext, root_folder, verbose=verbose)
-                    dst = os.path.join(root_folder, new_name)
-                    renamed_conflicts += 1
-                    if s:
-                        s.inc("renamed")
+                if s:
+                    s.inc("found")
+
+                dst = os.path.join(root_folder, fname)
+
+                if fname in existing:
+                    if rename_files:
+                        base, ext = os.path.splitext(fname)
+                        new_name = get_new_name(base, ext, existing, verbose=verbose)
+                        dst = os.path.join(root_folder, new_name)
+                        renamed_conflicts += 1
+                        if s:
+                            s.inc("renamed")
+                        if verbose:
+                            logging.debug(
+                                f"Conflict: renaming {fname} -> {new_name}",
+                                extra={"target": fname},
+                            )
+                    else:
+                        skipped_conflicts += 1
+                        if s:
+                            s.inc("skipped_conflict")
+                        if verbose:
+                            logging.debug(
+                                f"Conflict: file exists in root, skipping {fname}",
+                                extra={"target": fname},
+                            )
+                        continue
+
+                try:
                     if verbose:
                         logging.debug(
-                            f"Conflict: renaming {fname} -> {new_name}",
+                            f"Moving {fname} -> {os.path.basename(root_folder)}",
                             extra={"target": fname},
                         )
-                else:
+                    while True:
+                        try:
+                            fast_move(src, dst, exclusive=True)
+                            break
+                        except FileExistsError:
+                            # present in root but not in `existing`: created meanwhile,
+                            # or a case-only match on a case-insensitive filesystem
+                            existing.add(os.path.basename(dst))
+                            if not rename_files:
+                                raise
+                            base, ext = os.path.splitext(fname)
+                            dst = os.path.join(root_folder, get_new_name(base, ext, existing, verbose=verbose))
+                    existing.add(os.path.basename(dst))
+                    files_moved_this_run += 1
+                    if s:
+                        s.inc("moved")
+                    logging.info(
+                        "Moved file to %s",
+                        root_folder,
+                        extra={"target": os.path.basename(dst)},
+                    )
+                except FileExistsError:
                     skipped_conflicts += 1
                     if s:
                         s.inc("skipped_conflict")
@@ -95,55 +139,35 @@ def flatten_folder(root_folder, rename_files, depth=None, verbose=False, summary
                             f"Conflict: file exists in root, skipping {fname}",
                             extra={"target": fname},
                         )
-                    continue
-
-            try:
-                if verbose:
-                    logging.debug(
-                        f"Moving {fname} -> {os.path.basename(root_folder)}",
-                        extra={"target": fname},
+                except FileNotFoundError:
+                    logging.error(
+                        "File could not be moved. File not found.",
+                        extra={"target": os.path.basename(src)},
                     )
-                shutil.move(src, dst)
-                files_moved_this_run += 1
-                if s:
-                    s.inc("moved")
-                logging.info(
-                    "Moved file to %s",
-                    root_folder,
-                    extra={"target": os.path.basename(dst)},
-                )
-            except FileNotFoundError:
-                logging.error(
-                    "File could not be moved. File not found.",
-                    extra={"target": os.path.basename(src)},
-                )
-                if s:
-                    s.inc("errors")
+                    if s:
+                        s.inc("errors")
 
-    # second pass: remove empty directories, deepest-first
-    # walk bottom-up to ensure we try to remove deepest empties first
-    for dirpath, dirnames, filenames in os.walk(root_folder, topdown=False):
-        if dirpath == root_folder:
-            continue
         try:
-            # check emptiness after moves
-            if not os.listdir(dirpath):
-                if verbose:
-                    logging.debug(
-                        f"Removing empty folder: {dirpath}",
-                        extra={"target": os.path.basename(dirpath)},
-                    )
-                os.rmdir(dirpath)
-                folders_removed += 1
-                if s:
-                    s.inc("folders_removed")
-                logging.info(
-                    "Removed empty folder",
-                    extra={"target": os.path.basename(dirpath)},
-                )
+            # rmdir refuses non-empty folders, so no separate emptiness listing is needed
+            os.rmdir(dirpath)
         except OSError:
             # not empty or cannot remove; ignore
-            pass
+            continue
+        if level == 1:
+            # a direct child of root: its name is free there again
+            existing.discard(os.path.basename(dirpath))
+        if verbose:
+            logging.debug(
+                f"Removed empty folder: {dirpath}",
+                extra={"target": os.path.basename(dirpath)},
+            )
+        folders_removed += 1
+        if s:
+            s.inc("folders_removed")
+        logging.info(
+            "Removed empty folder",
+            extra={"target": os.path.basename(dirpath)},
+        )
 
     # keep a couple of handy metrics
     if s:
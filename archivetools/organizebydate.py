@@ -1,136 +1,261 @@
 import os
-import shutil
 import argparse
 import datetime
-import calendar
+import functools
 import logging
+import threading
+from collections import defaultdict
 from PIL import Image  # noqa: F401
 
 from archivetools import (
     __version__,
     get_dates_from_file,
     select_date,
+    fast_move,
     SIDECAR_EXTENSIONS,
     MEDIA_EXTENSIONS,
     MONTH_NAMES,
     WEEK_PREFIX,
     RunSummary,  # <— added
+    index_sidecars,
+    buffer_console_logging,
+    queue_console_logging,
+    run_in_threads,
 )
 
-def move_sidecar_files(file_path, target_folder, verbose=False):
-    base_name, file_extension = os.path.splitext(os.path.basename(file_path))
-    base_path = os.path.splitext(file_path)[0]
-    for ext in SIDECAR_EXTENSIONS:
-        potential_sidecars = [
-            f"{base_path}{ext}",
-            f"{file_path}{ext}"
-        ]
-        for sidecar_path in potential_sidecars:
-            if os.path.exists(sidecar_path):
-                target_sidecar_path = os.path.join(target_folder, os.path.basename(sidecar_path))
-                target_sidecar_path = generate_unique_filename(target_sidecar_path)
+def _entry_stat(entry):
+    """The DirEntry's stat (cached, and taken from the listing on Windows), or None."""
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+def move_sidecar_files(file_path, target_folder, verbose=False, dir_entries=None, resolver=None, base_name=None, sidecar_index=None):
+    """
+    Move "name.ext" and "name.jpg.ext" sidecars of file_path into target_folder.
+    If `dir_entries` (the set of names in the source folder) is given, candidates
+    are looked up there instead of stat()ed, and taken sidecars are removed from it.
+    `sidecar_index` (from index_sidecars over the same folder) narrows the
+    candidates to sidecars that actually exist; without it, one is built from
+    `dir_entries`, so names like "IMG_1.XMP" match whatever the extension's case.
+    Name clashes in target_folder are resolved through `resolver` (built on demand).
+    `base_name` is file_path's name without extension, if the caller already has it.
+    """
+    source_dir, file_name = os.path.split(file_path)
+    if base_name is None:
+        base_name = os.path.splitext(file_name)[0]
+    if sidecar_index is None and dir_entries is not None:
+        sidecar_index = index_sidecars(tuple(dir_entries))
+    if sidecar_index is not None:
+        candidates = sidecar_index.get(base_name, []) + sidecar_index.get(file_name, [])
+    else:
+        candidates = [name for ext in SIDECAR_EXTENSIONS for name in (f"{base_name}{ext}", f"{file_name}{ext}")]
+    for sidecar_name in candidates:
+        if dir_entries is not None:
+            # claim the name; set.remove is atomic, so two media files sharing
+            # a base name in different threads can't both take the sidecar
+            try:
+                dir_entries.remove(sidecar_name)
+            except KeyError:
+                continue
+            sidecar_path = os.path.join(source_dir, sidecar_name)
+        else:
+            sidecar_path = os.path.join(source_dir, sidecar_name)
+            if not os.path.exists(sidecar_path):
+                continue
+        if resolver is None:
+            resolver = _ConflictResolver(target_folder)
+        target_sidecar_path = os.path.join(target_folder, resolver.unique(sidecar_name))
+        try:
+            if verbose:
+                logging.debug("Moving sidecar: %s -> %s", sidecar_path, target_sidecar_path, extra={'target': sidecar_name})
+            while True:
                 try:
-                    if verbose:
-                        logging.debug(f"Moving sidecar: {sidecar_path} -> {target_sidecar_path}", extra={'target': os.path.basename(sidecar_path)})
-                    shutil.move(sidecar_path, target_sidecar_path)
-                    logging.info("Moved sidecar file to %s", target_folder, extra={'target': os.path.basename(sidecar_path)})
-                except FileNotFoundError:
-                    logging.error("Sidecar file could not be moved. File not found.", extra={'target': os.path.basename(sidecar_path)})
-
-def generate_unique_filename(target_path):
-    base, extension = os.path.splitext(target_path)
-    counter = 1
-    candidate = target_path
-    while os.path.exists(candidate):
-        candidate = f"{base}_{counter}{extension}"
-        counter += 1
-    return candidate
-
-def organize_files(target_dir, mode, rename_files, midnight_shift, get_folder_name_func, verbose=False, summary=None):  # <— summary
+                    fast_move(sidecar_path, target_sidecar_path, exclusive=True)
+                    break
+                except FileExistsError:
+                    target_sidecar_path = os.path.join(target_folder, resolver.unique(sidecar_name))
+            logging.info("Moved sidecar file to %s", target_folder, extra={'target': sidecar_name})
+        except FileNotFoundError:
+            logging.error("Sidecar file could not be moved. File not found.", extra={'target': sidecar_name})
+
+class _ConflictResolver:
+    """Names present in one target folder, snapshotted with a single os.scandir."""
+
+    def __init__(self, folder):
+        with os.scandir(folder) as it:
+            self.existing = {entry.name for entry in it}
+
+    def __contains__(self, name):
+        return name in self.existing
+
+    def add(self, name):
+        self.existing.add(name)
+
+    def unique(self, file_name):
+        """Return the first free "base_n.ext" variant of file_name and reserve it."""
+        base, extension = os.path.splitext(file_name)
+        counter = 1
+        candidate = file_name
+        while candidate in self.existing:
+            candidate = f"{base}_{counter}{extension}"
+            counter += 1
+        self.existing.add(candidate)
+        return candidate
+
+def organize_files(target_dir, mode, rename_files, midnight_shift, get_folder_name_func, verbose=False, summary=None, jobs=1):  # <— summary
     if verbose:
-        logging.debug(f"Organizing files in {target_dir} with mode={mode}", extra={'target': os.path.basename(target_dir)})
+        logging.debug("Organizing files in %s with mode=%s", target_dir, mode, extra={'target': os.path.basename(target_dir)})
+
+    with os.scandir(target_dir) as it:
+        entries = list(it)
+    # source names, so sidecar lookups need no stat() per candidate extension
+    dir_entries = {entry.name for entry in entries}
+    sidecar_index = index_sidecars(dir_entries)
 
-    for file_name in os.listdir(target_dir):
-        file_path = os.path.join(target_dir, file_name)
-        file_extension = os.path.splitext(file_name)[1].lower()
-        if os.path.isfile(file_path) and file_extension in MEDIA_EXTENSIONS:
-            if summary: summary.inc('found')  # <— added
+    # date extraction and moves run in parallel; folder creation, conflict checks
+    # and moves into the same target folder are serialized by that folder's lock
+    folder_locks = defaultdict(threading.Lock)
+    folder_locks_guard = threading.Lock()
+    resolvers = {}
+    # folder name -> joined path, so each bucket's path is built once
+    folder_paths = {}
+
+    def process_one(entry):
+        file_name = entry.name
+        file_path = entry.path
+        base_name, file_extension = os.path.splitext(file_name)
+        # cheap string test first; is_file() may still stat() on filesystems without d_type
+        if file_extension.lower() not in MEDIA_EXTENSIONS:
+            return
+        if not entry.is_file():
+            return
+        if summary: summary.inc('found')  # <— added
+        if verbose:
+            logging.debug("Processing file: %s", file_path, extra={'target': file_name})
+
+        # sidecars from the listing; their names aren't probed per SIDECAR_EXTENSIONS entry.
+        # Names no longer in dir_entries were already moved with another media file.
+        sidecars = [
+            os.path.join(target_dir, n)
+            for n in sidecar_index.get(base_name, []) + sidecar_index.get(file_name, [])
+            if n in dir_entries
+        ]
+        dates = get_dates_from_file(file_path, stat_result=_entry_stat(entry), sidecars=sidecars)
+        selected_date_info = select_date(dates, mode=mode, midnight_shift=midnight_shift)
+        if selected_date_info:
+            date_source, date_used = selected_date_info
+            if summary: summary.inc(f"source_{str(date_source).lower()}")  # <— added
+            if verbose:
+                logging.debug("Date selected for %s: %s (source: %s)", file_name, date_used, date_source, extra={'target': file_name})
+        else:
             if verbose:
-                logging.debug(f"Processing file: {file_path}", extra={'target': file_name})
+                logging.debug("No valid date found for %s, skipping.", file_name, extra={'target': file_name})
+            logging.info("No valid date found. Skipping.", extra={'target': file_name})
+            if summary: summary.inc('skipped_no_date')  # <— added
+            return
 
-            dates = get_dates_from_file(file_path)
-            selected_date_info = select_date(dates, mode=mode, midnight_shift=midnight_shift)
-            if selected_date_info:
-                date_source, date_used = selected_date_info
-                if summary: summary.inc(f"source_{str(date_source).lower()}")  # <— added
-                if verbose:
-                    logging.debug(f"Date selected for {file_name}: {date_used} (source: {date_source})", extra={'target': file_name})
-            else:
-                if verbose:
-                    logging.debug(f"No valid date found for {file_name}, skipping.", extra={'target': file_name})
-                logging.info("No valid date found. Skipping.", extra={'target': os.path.basename(file_name)})
-                if summary: summary.inc('skipped_no_date')  # <— added
-                continue
+        folder_name = get_folder_name_func(date_used)
+        target_folder = folder_paths.get(folder_name)
+        if target_folder is None:
+            target_folder = folder_paths.setdefault(folder_name, os.path.join(target_dir, folder_name))
 
-            folder_name = get_folder_name_func(date_used)
-            target_folder = os.path.join(target_dir, folder_name)
+        with folder_locks_guard:
+            folder_lock = folder_locks[target_folder]
+        with folder_lock:
+            # one existence check and one listing per distinct bucket, not per file
+            resolver = resolvers.get(target_folder)
+            if resolver is None:
+                if not os.path.isdir(target_folder):
+                    if verbose:
+                        logging.debug("Creating folder: %s", target_folder, extra={'target': folder_name})
+                    os.makedirs(target_folder, exist_ok=True)
+                    if summary: summary.inc('folders_created')  # <— added
+                resolver = resolvers[target_folder] = _ConflictResolver(target_folder)
 
-            if not os.path.exists(target_folder):
+            target_name = file_name
+            if target_name in resolver:
+                if rename_files:
+                    target_name = resolver.unique(file_name)
+                    if verbose:
+                        logging.debug("Renaming %s -> %s", file_name, target_name, extra={'target': file_name})
+                    if summary: summary.inc('renamed')  # <— added
+                else:
+                    if verbose:
+                        logging.debug("File with same name exists in %s, skipping %s.", target_folder, file_name, extra={'target': file_name})
+                    logging.warning("Skipping - File with same name exists.", extra={'target': file_name})
+                    if summary: summary.inc('skipped_conflict')  # <— added
+                    return
+            else:
+                resolver.add(target_name)
+            try:
                 if verbose:
-                    logging.debug(f"Creating folder: {target_folder}", extra={'target': folder_name})
-                os.makedirs(target_folder, exist_ok=True)
-                if summary: summary.inc('folders_created')  # <— added
-
-            target_path = os.path.join(target_folder, file_name)
-            if os.path.exists(file_path):
-                if os.path.exists(target_path):
-                    if rename_files:
-                        new_target_path = generate_unique_filename(target_path)
+                    logging.debug("Moving %s to %s", file_name, target_folder, extra={'target': file_name})
+                while True:
+                    try:
+                        fast_move(file_path, os.path.join(target_folder, target_name), exclusive=True)
+                        break
+                    except FileExistsError:
+                        # taken outside the snapshot: another process, or a case-only
+                        # difference on a case-insensitive filesystem
+                        if not rename_files:
+                            logging.warning("Skipping - File with same name exists.", extra={'target': file_name})
+                            if summary: summary.inc('skipped_conflict')
+                            return
+                        if target_name == file_name and summary:
+                            summary.inc('renamed')
+                        target_name = resolver.unique(file_name)
                         if verbose:
-                            logging.debug(f"Renaming {file_name} -> {os.path.basename(new_target_path)}", extra={'target': file_name})
-                        target_path = new_target_path
-                        if summary: summary.inc('renamed')  # <— added
-                    else:
-                        if verbose:
-                            logging.debug(f"File with same name exists in {target_folder}, skipping {file_name}.", extra={'target': file_name})
-                        logging.warning("Skipping - File with same name exists.", extra={'target': os.path.basename(file_name)})
-                        if summary: summary.inc('skipped_conflict')  # <— added
-                        continue
-                try:
-                    if verbose:
-                        logging.debug(f"Moving {file_name} to {target_folder}", extra={'target': file_name})
-                    shutil.move(file_path, target_path)
-                    if summary: summary.inc('moved')  # <— added
-                    logging.info("Moved file to %s (%s: %s)", target_folder, date_source, date_used.strftime('%Y-%m-%d'), extra={'target': os.path.basename(file_name)})
+                            logging.debug("Renaming %s -> %s", file_name, target_name, extra={'target': file_name})
+                if summary: summary.inc('moved')  # <— added
+                logging.info("Moved file to %s (%s: %s)", target_folder, date_source, date_used.strftime('%Y-%m-%d'), extra={'target': file_name})
+
+                move_sidecar_files(file_path, target_folder, verbose=verbose, dir_entries=dir_entries, resolver=resolver, base_name=base_name, sidecar_index=sidecar_index)
+            except FileNotFoundError:
+                logging.error("File could not be moved. File not found.", extra={'target': file_name})
+                if summary: summary.inc('errors')  # <— added
 
-                    move_sidecar_files(file_path, target_folder, verbose=verbose)
-                except FileNotFoundError:
-                    logging.error("File could not be moved. File not found.", extra={'target': os.path.basename(file_name)})
-                    if summary: summary.inc('errors')  # <— added
+    # Ctrl-C cancels the files not started yet; running moves finish
+    run_in_threads(process_one, entries, jobs)
 
     if verbose:
-        logging.debug(f"Finished organizing files in {target_dir}", extra={'target': os.path.basename(target_dir)})
+        logging.debug("Finished organizing files in %s", target_dir, extra={'target': os.path.basename(target_dir)})
 
-def organize_files_by_day(target_dir, mode, rename_files, midnight_shift, verbose=False, summary=None):  # <— summary
-    organize_files(target_dir, mode, rename_files, midnight_shift, lambda date: date.strftime('%Y%m%d'), verbose=verbose, summary=summary)
+def organize_files_by_day(target_dir, mode, rename_files, midnight_shift, verbose=False, summary=None, jobs=1):  # <— summary
+    organize_files(target_dir, mode, rename_files, midnight_shift, lambda date: date.strftime('%Y%m%d'), verbose=verbose, summary=summary, jobs=jobs)
 
-def organize_files_by_week(target_dir, mode, rename_files, midnight_shift, verbose=False, summary=None):  # <— summary
+@functools.lru_cache(maxsize=512)
+def _week_folder_name(iso_year, iso_week):
+    """Folder name for an ISO week; cached since a run only touches a few distinct weeks."""
+    # Monday of ISO week 1 is the Monday on or before January 4th (date.fromisocalendar is 3.8+)
+    jan4 = datetime.date(iso_year, 1, 4)
+    start_date = jan4 + datetime.timedelta(days=1 - jan4.isoweekday(), weeks=iso_week - 1)
+    end_date = start_date + datetime.timedelta(days=6)
+    return f'{start_date.strftime("%Y%m%d")}-{end_date.strftime("%Y%m%d")} - {WEEK_PREFIX}{iso_week:02d}'
+
+@functools.lru_cache(maxsize=512)
+def _month_folder_name(year, month):
+    """Folder name for a calendar month; cached like _week_folder_name."""
+    return f'{year:04d}{month:02d} - {MONTH_NAMES[month]} {year}'
+
+def organize_files_by_week(target_dir, mode, rename_files, midnight_shift, verbose=False, summary=None, jobs=1):  # <— summary
     def get_folder_name(date_used):
         iso_year, iso_week, _ = date_used.isocalendar()
-        start_date = datetime.datetime.strptime(f'{iso_year}-W{iso_week}-1', "%G-W%V-%u").date()
-        end_date = start_date + datetime.timedelta(days=6)
-        return f'{start_date.strftime("%Y%m%d")}-{end_date.strftime("%Y%m%d")} - {WEEK_PREFIX}{iso_week:02d}'
-    organize_files(target_dir, mode, rename_files, midnight_shift, get_folder_name, verbose=verbose, summary=summary)
+        return _week_folder_name(iso_year, iso_week)
+    organize_files(target_dir, mode, rename_files, midnight_shift, get_folder_name, verbose=verbose, summary=summary, jobs=jobs)
 
-def organize_files_by_month(target_dir, mode, rename_files, midnight_shift, verbose=False, summary=None):  # <— summary
-    def get_folder_name(date_used):
-        start_date = datetime.datetime(date_used.year, date_used.month, 1)
-        end_date = datetime.datetime(date_used.year, date_used.month, calendar.monthrange(date_used.year, date_used.month)[1])
-        return f'{start_date.strftime("%Y%m")} - {MONTH_NAMES[date_used.month]} {date_used.year}'
-    organize_files(target_dir, mode, rename_files, midnight_shift, get_folder_name, verbose=verbose, summary=summary)
+def organize_files_by_month(target_dir, mode, rename_files, midnight_shift, verbose=False, summary=None, jobs=1):  # <— summary
+    organize_files(target_dir, mode, rename_files, midnight_shift, lambda date: _month_folder_name(date.year, date.month), verbose=verbose, summary=summary, jobs=jobs)
+
+def organize_files_by_year(target_dir, mode, rename_files, midnight_shift, verbose=False, summary=None, jobs=1):  # <— summary
+    organize_files(target_dir, mode, rename_files, midnight_shift, lambda date: date.strftime('%Y'), verbose=verbose, summary=summary, jobs=jobs)
 
-def organize_files_by_year(target_dir, mode, rename_files, midnight_shift, verbose=False, summary=None):  # <— summary
-    organize_files(target_dir, mode, rename_files, midnight_shift, lambda date: date.strftime('%Y'), verbose=verbose, summary=summary)
+ORGANIZERS = {
+    'day': organize_files_by_day,
+    'week': organize_files_by_week,
+    'month': organize_files_by_month,
+    'year': organize_files_by_year,
+}
 
 def main():
     parser = argparse.ArgumentParser(
@@ -162,10 +287,15 @@ def main():
         default=0,
         help="Shift dates earlier by N hours to avoid late-night spillover (e.g., 3 moves 00:00–02:59 to the previous day). If flag is provided without a value, defaults to 3.",
     )
+    parser.add_argument("--jobs", type=int, default=8, help="Number of files whose dates are read in parallel")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
     args = parser.parse_args()
 
     logging.getLogger().setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    # one log line per file; batch them so large folders don't cost a write() each,
+    # and keep the writing on a listener thread so --jobs workers don't wait on it
+    buffer_console_logging()
+    queue_console_logging()
 
     target_dir = args.folder
     rename_files = args.rename
@@ -177,20 +307,9 @@ def main():
     s.set('mode', mode)
     s.set('rename', bool(rename_files))
     s.set('midnight_shift_h', int(midnight_shift or 0))
-    granularity = None
-
-    if args.day:
-        granularity = 'day'
-        organize_files_by_day(target_dir, mode, rename_files, midnight_shift, verbose=args.verbose, summary=s)
-    elif args.week:
-        granularity = 'week'
-        organize_files_by_week(target_dir, mode, rename_files, midnight_shift, verbose=args.verbose, summary=s)
-    elif args.month:
-        granularity = 'month'
-        organize_files_by_month(target_dir, mode, rename_files, midnight_shift, verbose=args.verbose, summary=s)
-    elif args.year:
-        granularity = 'year'
-        organize_files_by_year(target_dir, mode, rename_files, midnight_shift, verbose=args.verbose, summary=s)
+    # --day/--week/--month/--year are mutually exclusive and one is required
+    granularity = next(g for g in ORGANIZERS if getattr(args, g))
+    ORGANIZERS[granularity](target_dir, mode, rename_files, midnight_shift, verbose=args.verbose, summary=s, jobs=args.jobs)
 
     # end-of-run summary (2–3 lines)
     s.set('granularity', granularity)
@@ -3,50 +3,96 @@ import sys
 import argparse
 import datetime
 import logging
+import struct
 import subprocess
 from PIL import Image, ExifTags
 import piexif
-from archivetools import __version__, get_dates_from_file, select_date, SIDECAR_EXTENSIONS, MEDIA_EXTENSIONS, RunSummary
+from archivetools import __version__, get_dates_from_file, select_date, SIDECAR_EXTENSIONS, MEDIA_EXTENSIONS, RunSummary, index_sidecars, queue_console_logging, run_in_threads
 
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s]\t%(target)s:\t%(message)s")
 
-def set_file_timestamp(file_path, selected_date, dry_run=False, verbose=False):
+# extensions whose EXIF / MP4 header dates setdates rewrites
+_JPEG_EXTENSIONS = frozenset(('.jpg', '.jpeg'))
+_MP4_EXTENSIONS = frozenset(('.mp4', '.mov'))
+
+# per-file outcome of set_selected_date, counted in the run summary
+UPDATED, UNCHANGED, FAILED = 'updated', 'unchanged', 'failed'
+
+# seconds from the MP4/QuickTime epoch (1904-01-01 UTC) to the Unix epoch
+MP4_EPOCH_OFFSET = 2082844800
+
+def _utime_pair(selected_date):
+    """(atime, mtime) tuple for os.utime; computed once per file and shared by its sidecars."""
+    ts = selected_date.timestamp()
+    return (ts, ts)
+
+def set_file_timestamp(file_path, selected_date, dry_run=False, verbose=False, times=None):
     if verbose:
-        logging.debug(f"{'Would set' if dry_run else 'Setting'} OS timestamps for {file_path} to {selected_date}", extra={'target': os.path.basename(file_path)})
+        logging.debug("%s OS timestamps for %s to %s", "Would set" if dry_run else "Setting", file_path, selected_date, extra={'target': os.path.basename(file_path)})
     try:
         if not dry_run:
-            os.utime(file_path, (selected_date.timestamp(), selected_date.timestamp()))
+            os.utime(file_path, times or _utime_pair(selected_date))
         return True
     except Exception as e:
         logging.error("Failed to set file dates: %s", e, extra={'target': os.path.basename(file_path)})
         return False
 
-def set_sidecar_timestamps(file_path, selected_date, dry_run=False, verbose=False):
-    base_path, _ = os.path.splitext(file_path)
-    updated = False
-    for ext in SIDECAR_EXTENSIONS:
-        sidecar_path = f"{base_path}{ext}"
-        if os.path.exists(sidecar_path):
-            if verbose:
-                logging.debug(f"{'Would set' if dry_run else 'Setting'} sidecar timestamps for {sidecar_path} to {selected_date}", extra={'target': os.path.basename(sidecar_path)})
+def _mtime(path):
+    """st_mtime of a path or os.DirEntry; a DirEntry caches its stat (and gets it from the listing on Windows)."""
+    return path.stat().st_mtime if isinstance(path, os.DirEntry) else os.stat(path).st_mtime
+
+def set_sidecar_timestamps(file_path, selected_date, dry_run=False, verbose=False, times=None, sidecars=None, force=False):
+    """
+    Set the timestamps of the "name.ext" sidecars of file_path. `sidecars` (paths
+    or DirEntry objects, e.g. from index_sidecars) skips probing every
+    SIDECAR_EXTENSIONS candidate. Sidecars already at the date are left alone unless `force`.
+    Returns FAILED if any sidecar could not be set, else UPDATED or UNCHANGED.
+    """
+    updated = failed = False
+    if times is None:
+        times = _utime_pair(selected_date)
+    if sidecars is None:
+        base_path, _ = os.path.splitext(file_path)
+        sidecars = [f"{base_path}{ext}" for ext in SIDECAR_EXTENSIONS if os.path.exists(f"{base_path}{ext}")]
+    for sidecar in sidecars:
+        sidecar_path = os.fspath(sidecar)
+        if not force:
             try:
-                if not dry_run:
-                    os.utime(sidecar_path, (selected_date.timestamp(), selected_date.timestamp()))
-                updated = True
-            except Exception as e:
-                logging.error("Failed to set sidecar file dates: %s", e, extra={'target': os.path.basename(sidecar_path)})
-    return updated
-
-def set_exif_date(file_path, selected_date, dry_run=False, verbose=False):
+                if abs(_mtime(sidecar) - times[1]) < 1:
+                    if verbose:
+                        logging.debug("Sidecar timestamps already match for %s. Skipping.", sidecar_path, extra={'target': os.path.basename(sidecar_path)})
+                    continue
+            except OSError:
+                pass
+        if verbose:
+            logging.debug("%s sidecar timestamps for %s to %s", "Would set" if dry_run else "Setting", sidecar_path, selected_date, extra={'target': os.path.basename(sidecar_path)})
+        try:
+            if not dry_run:
+                os.utime(sidecar_path, times)
+            updated = True
+        except Exception as e:
+            logging.error("Failed to set sidecar file dates: %s", e, extra={'target': os.path.basename(sidecar_path)})
+            failed = True
+    if failed:
+        return FAILED
+    return UPDATED if updated else UNCHANGED
+
+def load_exif(file_path):
+    """piexif dict for file_path, or an empty one if its EXIF can't be read."""
+    try:
+        return piexif.load(file_path)
+    except Exception:
+        return {"0th": {}, "Exif": {}, "GPS": {}, "1st": {}, "thumbnail": None}
+
+def set_exif_date(file_path, selected_date, dry_run=False, verbose=False, exif_dict=None):
+    """Write selected_date to the EXIF date tags. `exif_dict` (from load_exif) is updated in place instead of parsing the header again."""
     if verbose:
-        logging.debug(f"{'Would set' if dry_run else 'Setting'} EXIF date for {file_path} to {selected_date}", extra={'target': os.path.basename(file_path)})
+        logging.debug("%s EXIF date for %s to %s", "Would set" if dry_run else "Setting", file_path, selected_date, extra={'target': os.path.basename(file_path)})
     try:
         if dry_run:
             return True
-        try:
-            exif_dict = piexif.load(file_path)
-        except Exception:
-            exif_dict = {"0th": {}, "Exif": {}, "GPS": {}, "1st": {}, "thumbnail": None}
+        if exif_dict is None:
+            exif_dict = load_exif(file_path)
         dt_str = selected_date.strftime("%Y:%m:%d %H:%M:%S")
         exif_dict["0th"][piexif.ImageIFD.DateTime] = dt_str.encode()
         exif_dict["Exif"][piexif.ExifIFD.DateTimeOriginal] = dt_str.encode()
@@ -58,15 +104,115 @@ def set_exif_date(file_path, selected_date, dry_run=False, verbose=False):
         logging.error("Failed to write EXIF date: %s", e, extra={'target': os.path.basename(file_path)})
         return False
 
-def set_ffprobe_date(file_path, selected_date, dry_run=False, verbose=False):
+def _same_second(current, selected_date):
+    """True if both datetimes are the same instant to within a second; naive values are local time."""
+    if current is None:
+        return False
+    try:
+        return abs((current.astimezone() - selected_date.astimezone()).total_seconds()) < 1
+    except (OverflowError, OSError, ValueError):
+        return False
+
+def _creation_time_matches(current_dates, selected_date):
+    """True if the container creation_time ffprobe reported already equals selected_date (to the second)."""
+    current = current_dates.get('CreationTime') or current_dates.get('FFprobe CreationTime')
+    if current is not None and current.tzinfo is None:
+        # the strptime fallback drops the trailing Z; the value is UTC
+        current = current.replace(tzinfo=datetime.timezone.utc)
+    return _same_second(current, selected_date)
+
+def _exif_dates_match(current_dates, selected_date):
+    """True if all three EXIF date tags already hold selected_date."""
+    return all(
+        _same_second(current_dates.get(tag), selected_date)
+        for tag in ("DateTime", "DateTimeOriginal", "DateTimeDigitized")
+    )
+
+def _iter_boxes(f, start, end):
+    """Yield (type, payload_offset, box_end) for each MP4 box between start and end."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack('>I4s', header)
+        payload = pos + 8
+        if size == 1:
+            large = f.read(8)
+            if len(large) < 8:
+                return
+            size = struct.unpack('>Q', large)[0]
+            payload += 8
+        elif size == 0:
+            size = end - pos
+        if size < payload - pos:
+            return
+        yield box_type, payload, pos + size
+        pos += size
+
+# boxes carrying creation/modification times, and the containers leading to them
+_TIME_BOXES = {(b'moov', b'mvhd'), (b'moov', b'trak', b'tkhd'), (b'moov', b'trak', b'mdia', b'mdhd')}
+_TIME_BOX_PARENTS = {(b'moov',), (b'moov', b'trak'), (b'moov', b'trak', b'mdia')}
+
+def _find_time_boxes(f, start, end, path=()):
+    """Yield (type, payload_offset) for every mvhd/tkhd/mdhd box between start and end."""
+    for box_type, payload, box_end in _iter_boxes(f, start, end):
+        box_path = path + (box_type,)
+        if box_path in _TIME_BOXES:
+            yield box_type, payload
+        elif box_path in _TIME_BOX_PARENTS:
+            yield from _find_time_boxes(f, payload, box_end, box_path)
+
+def patch_mp4_creation_time(file_path, selected_date):
+    """
+    Overwrite the creation/modification times in moov/mvhd and in every track's
+    tkhd and mdhd in place (a few bytes each).
+    Returns False, without writing anything, when there is no mvhd or a box can't
+    hold the date, so the caller can fall back to ffmpeg.
+    """
+    mac_time = int(selected_date.timestamp()) + MP4_EPOCH_OFFSET
+    if mac_time < 0:
+        return False
+    with open(file_path, 'r+b') as f:
+        file_end = f.seek(0, os.SEEK_END)
+        boxes = list(_find_time_boxes(f, 0, file_end))
+        if not any(box_type == b'mvhd' for box_type, _ in boxes):
+            return False
+        # check every box first so a file is never left half patched
+        writes = []
+        for _, payload in boxes:
+            f.seek(payload)
+            version = f.read(1)
+            if version == b'\x00' and mac_time <= 0xFFFFFFFF:
+                packed = struct.pack('>II', mac_time, mac_time)
+            elif version == b'\x01':
+                packed = struct.pack('>QQ', mac_time, mac_time)
+            else:
+                return False
+            # times follow the version + flags word
+            writes.append((payload + 4, packed))
+        for offset, packed in writes:
+            f.seek(offset)
+            f.write(packed)
+    return True
+
+def set_ffprobe_date(file_path, selected_date, dry_run=False, verbose=False, date_text=None):
     if verbose:
-        logging.debug(f"{'Would set' if dry_run else 'Setting'} FFprobe creation_time for {file_path} to {selected_date}", extra={'target': os.path.basename(file_path)})
+        logging.debug("%s FFprobe creation_time for %s to %s", "Would set" if dry_run else "Setting", file_path, selected_date, extra={'target': os.path.basename(file_path)})
     try:
         if dry_run:
             return True
+        # patch the header in place; only remux when the file has no plain mvhd
+        try:
+            if patch_mp4_creation_time(file_path, selected_date):
+                return True
+        except OSError as e:
+            if verbose:
+                logging.debug("In-place creation_time patch failed for %s: %s", file_path, e, extra={'target': os.path.basename(file_path)})
         temp_file = file_path + ".tmp.mp4"
         cmd = [
-            "ffmpeg", "-i", file_path, "-metadata", f"creation_time={selected_date.isoformat()}",
+            "ffmpeg", "-i", file_path, "-metadata", f"creation_time={date_text or selected_date.isoformat(sep=' ', timespec='seconds')}",
             "-codec", "copy", temp_file, "-y"
         ]
         subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
@@ -76,73 +222,138 @@ def set_ffprobe_date(file_path, selected_date, dry_run=False, verbose=False):
         logging.error("Failed to write FFprobe creation_time: %s", e, extra={'target': os.path.basename(file_path)})
         return False
 
-def set_selected_date(file_path, selected_date_info, current_dates, force=False, dry_run=False, verbose=False, summary=None):
+def set_selected_date(file_path, selected_date_info, current_dates, force=False, dry_run=False, verbose=False, summary=None, sidecars=None, exif_dict=None):
+    name = os.path.basename(file_path)
+    ext = os.path.splitext(name)[1].lower()
+    extra = {'target': name}
     if not selected_date_info:
         if verbose:
-            logging.debug(f"No date selected for {file_path}. Skipping.", extra={'target': os.path.basename(file_path)})
-        logging.info("No date selected. Skipping.", extra={'target': os.path.basename(file_path)})
+            logging.debug("No date selected for %s. Skipping.", file_path, extra=extra)
+        logging.info("No date selected. Skipping.", extra=extra)
         if summary is not None:
             summary.inc('no_date')
         return
 
     date_source, selected_date = selected_date_info
+    # isoformat is much cheaper than strftime; shared by the ffmpeg fallback and the log line
+    date_text = selected_date.isoformat(sep=' ', timespec='seconds')
     actions_taken = []
-    # summary counters
-    if summary is not None:
-        summary.inc('processed')
-
+    # set once EXIF or the video header is rewritten; that moves the mtime again
+    content_written = False
+    # set when any step fails, so the file isn't counted as up to date
+    failed = False
     if verbose:
-        logging.debug(f"Selected date for {file_path}: {selected_date} (source: {date_source})", extra={'target': os.path.basename(file_path)})
+        logging.debug("Selected date for %s: %s (source: %s)", file_path, selected_date, date_source, extra=extra)
 
     # track source and date range
     if summary is not None:
         summary.inc(f"source_{str(date_source).lower()}")
         # track earliest/latest date
-        earliest = summary['earliest_date'] if 'earliest_date' in getattr(summary, 'metrics', {}) else None
-        latest = summary['latest_date'] if 'latest_date' in getattr(summary, 'metrics', {}) else None
         try:
-            if not earliest or selected_date < earliest:
-                summary.set('earliest_date', selected_date)
-            if not latest or selected_date > latest:
-                summary.set('latest_date', selected_date)
+            summary.extend_range('earliest_date', 'latest_date', selected_date)
         except Exception:
             pass
 
-    if set_file_timestamp(file_path, selected_date, dry_run=dry_run, verbose=verbose):
-        actions_taken.append("File timestamps")
-        if summary is not None:
-            summary.inc('timestamps')
-    else:
-        pass
-    if set_sidecar_timestamps(file_path, selected_date, dry_run=dry_run, verbose=verbose):
+    times = _utime_pair(selected_date)
+    sidecar_status = set_sidecar_timestamps(file_path, selected_date, dry_run=dry_run, verbose=verbose, times=times, sidecars=sidecars, force=force)
+    if sidecar_status == UPDATED:
         actions_taken.append("Sidecar(s)")
         if summary is not None:
             summary.inc('sidecars')
-    if file_path.lower().endswith(('.jpg', '.jpeg')):
-        if set_exif_date(file_path, selected_date, dry_run=dry_run, verbose=verbose):
+    elif sidecar_status == FAILED:
+        failed = True
+        if summary is not None:
+            summary.inc('errors')
+    if ext in _JPEG_EXTENSIONS:
+        if not force and _exif_dates_match(current_dates, selected_date):
+            if verbose:
+                logging.debug("EXIF dates already match for %s. Skipping.", file_path, extra=extra)
+        elif set_exif_date(file_path, selected_date, dry_run=dry_run, verbose=verbose, exif_dict=exif_dict):
+            content_written = True
             actions_taken.append("EXIF")
             if summary is not None:
                 summary.inc('exif')
         else:
             # failed EXIF write
+            failed = True
             if summary is not None:
                 summary.inc('errors')
-    if file_path.lower().endswith(('.mp4', '.mov')):
-        if set_ffprobe_date(file_path, selected_date, dry_run=dry_run, verbose=verbose):
+    elif ext in _MP4_EXTENSIONS:
+        if not force and _creation_time_matches(current_dates, selected_date):
+            # the remux rewrites the whole file; skip it when it would change nothing
+            if verbose:
+                logging.debug("FFprobe creation_time already matches for %s. Skipping remux.", file_path, extra=extra)
+        elif set_ffprobe_date(file_path, selected_date, dry_run=dry_run, verbose=verbose, date_text=date_text):
+            content_written = True
             actions_taken.append("FFprobe")
             if summary is not None:
                 summary.inc('ffprobe')
         else:
+            failed = True
             if summary is not None:
                 summary.inc('errors')
-    if summary is not None and actions_taken:
-        summary.inc('updated')
-    logging.info("Updated (%s): %s (%s: %s)",
+    # last, since writing EXIF or the video header changes the file's mtime
+    if not force and not content_written and _same_second(current_dates.get('Modified'), selected_date):
+        if verbose:
+            logging.debug("File timestamps already match for %s. Skipping.", file_path, extra=extra)
+    elif set_file_timestamp(file_path, selected_date, dry_run=dry_run, verbose=verbose, times=times):
+        actions_taken.insert(0, "File timestamps")
+        if summary is not None:
+            summary.inc('timestamps')
+    else:
+        failed = True
+        if summary is not None:
+            summary.inc('errors')
+    if failed:
+        status = FAILED
+    else:
+        status = UPDATED if actions_taken else UNCHANGED
+    if summary is not None:
+        summary.inc(status)
+    logging.info("%s (%s): %s (%s: %s)",
+                 "Failed" if failed else "Updated",
                  ', '.join(actions_taken) if actions_taken else "Nothing",
-                 os.path.basename(file_path),
+                 name,
                  date_source,
-                 selected_date.strftime('%Y-%m-%d %H:%M:%S'),
-                 extra={'target': os.path.basename(file_path)})
+                 date_text,
+                 extra=extra)
+    return status
+
+def process_file(file_path, mode, force=False, dry_run=False, verbose=False, summary=None, sidecar_index=None, dir_entries=None):
+    """
+    Read, select and apply the date for one media file. Safe to run from worker threads.
+    `sidecar_index` (from index_sidecars over the file's folder) replaces the
+    per-extension sidecar probing in both the date lookup and the timestamp update.
+    `dir_entries` maps the folder's names to their DirEntry, whose cached stat is
+    used to skip sidecars that already carry the date.
+    """
+    file = os.path.basename(file_path)
+    if summary is not None:
+        summary.inc('processed')
+    if verbose:
+        logging.debug("Analyzing file: %s", file_path, extra={'target': file})
+    base_sidecars = all_sidecars = None
+    if sidecar_index is not None:
+        folder = os.path.dirname(file_path)
+        if dir_entries is not None:
+            as_path = dir_entries.__getitem__
+        else:
+            as_path = lambda name: os.path.join(folder, name)
+        base_sidecars = [as_path(n) for n in sidecar_index.get(os.path.splitext(file)[0], ())]
+        all_sidecars = base_sidecars + [as_path(n) for n in sidecar_index.get(file, ())]
+    # parse a JPEG's EXIF once; the dates are read from it and the new ones written into it
+    exif_dict = None
+    if os.path.splitext(file)[1].lower() in _JPEG_EXTENSIONS:
+        try:
+            exif_dict = piexif.load(file_path)
+        except Exception:
+            # get_dates_from_file falls back to Pillow; set_exif_date starts from an empty dict
+            pass
+    current_dates = get_dates_from_file(file_path, sidecars=all_sidecars, exif_dict=exif_dict)
+    if verbose:
+        logging.debug("Detected dates for %s: %s", file, current_dates, extra={'target': file})
+    selected_date_info = select_date(current_dates, mode)
+    set_selected_date(file_path, selected_date_info, current_dates, force=force, dry_run=dry_run, verbose=verbose, summary=summary, sidecars=base_sidecars, exif_dict=exif_dict)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -151,11 +362,12 @@ def main():
     )
     parser.add_argument('-v', '--version', action='version', version=f'ArchiveTools {__version__}')
     parser.add_argument('-f', '--folder', type=str, required=True, help='Path to the folder to process')
-    parser.add_argument('--force', action='store_true', help='Force overwrite of all timestamps regardless of age')
+    parser.add_argument('--force', action='store_true', help='Rewrite timestamps and metadata even where they already match the selected date')
     parser.add_argument('--dry-run', action='store_true', help='Preview changes without modifying files')
     parser.add_argument('--mode', type=str, default='default', choices=[
         'default', 'oldest', 'newest', 'exif', 'ffprobe', 'sidecar', 'filename', 'folder', 'metadata'
     ], help='Date selection strategy to use.')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Number of files processed in parallel')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose output')
     args = parser.parse_args()
 
@@ -163,6 +375,8 @@ def main():
         logging.getLogger().setLevel(logging.DEBUG)
     else:
         logging.getLogger().setLevel(logging.INFO)
+    # workers only enqueue log records; a listener thread writes them in order
+    queue_console_logging()
 
     folder_path = args.folder
     mode = args.mode
@@ -175,30 +389,41 @@ def main():
     s.set('force', bool(force))
 
     if args.verbose:
-        logging.debug(f"Processing folder {folder_path} with mode={mode}", extra={'target': os.path.basename(folder_path)})
+        logging.debug("Processing folder %s with mode=%s", folder_path, mode, extra={'target': os.path.basename(folder_path)})
 
     if not os.path.isdir(folder_path):
         logging.error("The specified path is not a directory.", extra={'target': os.path.basename(folder_path)})
         sys.exit(1)
 
-    for file in os.listdir(folder_path):
-        file_path = os.path.join(folder_path, file)
-        if os.path.isfile(file_path) and os.path.splitext(file)[1].lower() in MEDIA_EXTENSIONS:
-            if s: s.inc('processed')
-            if args.verbose:
-                logging.debug(f"Analyzing file: {file_path}", extra={'target': file})
-            current_dates = get_dates_from_file(file_path)
-            if args.verbose:
-                logging.debug(f"Detected dates for {file}: {current_dates}", extra={'target': file})
-            selected_date_info = select_date(current_dates, mode)
-            set_selected_date(file_path, selected_date_info, current_dates, force=force, dry_run=dry_run, verbose=args.verbose, summary=s)
+    with os.scandir(folder_path) as it:
+        entries = list(it)
+    # sidecars are looked up in this listing instead of stat()ing every candidate per file
+    dir_entries = {entry.name: entry for entry in entries}
+    sidecar_index = index_sidecars(dir_entries)
+    media_files = []
+    for entry in entries:
+        file = entry.name
+        file_path = entry.path
+        # extension test first; DirEntry.is_file() is usually answered from the listing
+        if os.path.splitext(file)[1].lower() in MEDIA_EXTENSIONS and entry.is_file():
+            media_files.append(file_path)
         elif args.verbose:
-            logging.debug(f"Skipping non-media file: {file_path}", extra={'target': file})
+            logging.debug("Skipping non-media file: %s", file_path, extra={'target': file})
+
+    # files are independent; EXIF/ffprobe reads and ffmpeg runs overlap across workers.
+    # Ctrl-C cancels the files not started yet.
+    run_in_threads(
+        lambda file_path: process_file(file_path, mode, force=force, dry_run=dry_run, verbose=args.verbose, summary=s, sidecar_index=sidecar_index, dir_entries=dir_entries),
+        media_files,
+        args.jobs,
+    )
 
     # End-of-run summary
     processed = s['processed'] or 0
     updated = s['updated'] or 0
     no_date = s['no_date'] or 0
+    unchanged = s['unchanged'] or 0
+    failed = s['failed'] or 0
 
     timestamps = s['timestamps'] or 0
     exif = s['exif'] or 0
@@ -208,7 +433,7 @@ def main():
     earliest = s['earliest_date']
     latest = s['latest_date']
 
-    line1 = (f"Processed {processed} files — {updated} updated, {no_date} had no selected date. "
+    line1 = (f"Processed {processed} files — {updated} updated, {unchanged} already up to date, {failed} failed, {no_date} had no selected date. "
              f"Mode: {s['mode']}. Dry-run: {'yes' if s['dry_run'] else 'no'}. Force: {'yes' if s['force'] else 'no'}. "
              f"Duration {s.duration_hms}.")
 
@@ -227,6 +452,8 @@ def main():
     s.emit_lines(lines, json_extra={
         'processed': processed,
         'updated': updated,
+        'unchanged': unchanged,
+        'failed': failed,
         'no_date': no_date,
         'timestamps': timestamps,
         'exif': exif,
@@ -240,7 +467,7 @@ def main():
     })
 
     if args.verbose:
-        logging.debug(f"Finished processing folder {folder_path}", extra={'target': os.path.basename(folder_path)})
+        logging.debug("Finished processing folder %s", folder_path, extra={'target': os.path.basename(folder_path)})
 
 if __name__ == "__main__":
     main()